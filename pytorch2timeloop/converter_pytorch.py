@@ -10,6 +10,10 @@ from torch import nn
 import torch.fx as fx
 
 import yaml
+try:
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper
 
 from pytorch2timeloop.utils.interpreter import Converter
 
@@ -26,6 +30,7 @@ def convert_model_with_sample_input(model: nn.Module,
                                     ignored_modules=None,
                                     bypassed_modules=None,
                                     exception_module_names=[],
+                                    skip_repeated_modules=False,
                                     ):
     """
     Convert a general PyTorch model to Timeloop problem files.
@@ -44,10 +49,14 @@ def convert_model_with_sample_input(model: nn.Module,
     :param save_dir: the directory to save the output in
     :param exception_module_names: a list of fragments of module names
         to ignore (can be a prefix, suffix, or infix).
+    :param skip_repeated_modules: only describe the first call of a
+        shared module with a given input shape; later calls produce no
+        workload.
     """
-    logger.info("converting {} in {} model ...".format("all", model_name))
+    logger.info("converting %s in %s model ...", "all", model_name)
 
-    layer_data = _make_summary(model, sample_input, ignored_func, ignored_modules, bypassed_modules)
+    layer_data = _make_summary(model, sample_input, ignored_func, ignored_modules, bypassed_modules,
+                               skip_repeated_modules=skip_repeated_modules)
     _convert_from_layer_data(layer_data, model_name, save_dir, fuse)
 
 
@@ -57,7 +66,8 @@ def convert_model(model: nn.Module, input_size: tuple, batch_size: int,
                   ignored_func=None,
                   ignored_modules=None,
                   bypassed_modules=None,
-                  exception_module_names=[]):
+                  exception_module_names=[],
+                  skip_repeated_modules=False):
     """
     Convert a PyTorch CNN model to Timeloop problem files.
 
@@ -75,17 +85,20 @@ def convert_model(model: nn.Module, input_size: tuple, batch_size: int,
     :param convert_fc: whether to convert fully connected layers
     :param exception_module_names: a list of fragments of module names
         to ignore (can be a prefix, suffix, or infix).
+    :param skip_repeated_modules: only describe the first call of a
+        shared module with a given input shape; later calls produce no
+        workload.
     """
     logger.info(
-        "converting {} in {} model ...".format(
-            "nn.Conv2d" if not convert_fc else "nn.Conv2d and nn.Linear",
-            model_name
-        )
+        "converting %s in %s model ...",
+        "nn.Conv2d" if not convert_fc else "nn.Conv2d and nn.Linear",
+        model_name
     )
     sample_input = torch.rand(2, *input_size).type(torch.FloatTensor)
     layer_data = _make_summary(model, sample_input, ignored_func=ignored_func,
                                ignored_modules=ignored_modules,
-                               bypassed_modules=bypassed_modules)
+                               bypassed_modules=bypassed_modules,
+                               skip_repeated_modules=skip_repeated_modules)
     _convert_from_layer_data(layer_data, model_name, save_dir, fuse=fuse)
 
 
@@ -102,11 +115,13 @@ def _convert_from_layer_data(layer_data, model_name, save_dir, fuse=False):
         file_name = model_name + '.yaml'
         file_path = os.path.abspath(os.path.join(save_dir, model_name, file_name))
         with open(file_path, 'w') as f:
-            f.write(yaml.dump(
+            yaml.dump(
                 {
                     'problem': problems
-                }
-            ))
+                },
+                f,
+                Dumper=SafeDumper
+            )
     else:
         # make the problem file for each layer
         for i in range(0, len(layer_data)):
@@ -114,13 +129,15 @@ def _convert_from_layer_data(layer_data, model_name, save_dir, fuse=False):
             file_name = '[layer' + str(i+1) + ']' + problem.name + '.yaml'
             file_path = os.path.abspath(os.path.join(save_dir, model_name, file_name))
             with open(file_path, 'w') as f:
-                f.write(yaml.dump({
+                yaml.dump({
                     'problem': problem.to_yaml()
-                    }))
+                    }, f, Dumper=SafeDumper)
 
     logger.info("conversion complete!\n")
 
-def _make_summary(model, sample_input, ignored_func, ignored_modules=None, bypassed_modules=None):
-    converter = Converter(fx.symbolic_trace(model), ignored_func=ignored_func, ignored_modules=ignored_modules, bypassed_modules=bypassed_modules)
+def _make_summary(model, sample_input, ignored_func, ignored_modules=None, bypassed_modules=None,
+                  skip_repeated_modules=False):
+    converter = Converter(fx.symbolic_trace(model), ignored_func=ignored_func, ignored_modules=ignored_modules, bypassed_modules=bypassed_modules,
+                          skip_repeated_modules=skip_repeated_modules)
     converter.run(*sample_input)
     return converter.summary
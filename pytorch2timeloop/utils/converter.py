@@ -19,111 +19,66 @@ add a new `LayerDescription` if the layer is very different from the
 ones that are already here.
 """
 
-from functools import singledispatch
 import logging
-from typing import Optional, Callable, Any
-import operator
+from typing import Callable, Dict
 
-import torch
 import torch.nn as nn
-import transformers.models.distilbert.modeling_distilbert
+from torch.nn.modules.utils import _pair
 
 from pytorch2timeloop.utils.layer_descriptions import (
     ConvLayerDescription,
-    ConvTransposeLayerDescription,
     MaxPoolLayerDescription,
-    MatrixMatrixMultiplyLayerDescription,
     MatmulFuncDescription
 )
 
 logger = logging.getLogger(__name__)
 
 
-@singledispatch
-def generate_description(module,
-                         input: torch.Tensor,
-                         output: torch.Tensor,
-                         name: str,
-                         ifmap_name: str):
-    raise NotImplementedError(f'not implemented for {type(module)}')
-
-
-@generate_description.register(nn.Conv2d)
-def _(module, input, output, name, ifmap_name):
-    description = ConvLayerDescription(
-        name=name,
-        g=module.groups,
-        m=output.shape[1],
-        w=input.shape[3],
-        h=input.shape[2],
-        c=input.shape[1],
-        n=input.shape[0],
-        s=module.kernel_size[1],
-        r=module.kernel_size[0],
-        w_pad=module.padding[1],
-        h_pad=module.padding[0],
-        w_stride=module.stride[1],
-        h_stride=module.stride[0],
-        ifmap_name=ifmap_name,
-        filter_name=f'{name}_filter',
-        ofmap_name=f'{name}_out'
-    )
+def _conv2d_desc(module, input_shape, output_shape, name, ifmap_name):
+    n, c, h, w = input_shape
+    ks, st, pd = module.kernel_size, module.stride, module.padding
+    filter_name, ofmap_name = name + '_filter', name + '_out'
+    description = ConvLayerDescription(name, module.groups, output_shape[1],
+                                       w, h, c, n, ks[1], ks[0],
+                                       pd[1], pd[0], st[1], st[0],
+                                       ifmap_name, filter_name, ofmap_name)
     return description
 
-@generate_description.register(nn.ConvTranspose2d)
-def _(module, input, output, name, ifmap_name):
-    # model as conv layers
-    new_h = int((input.shape[2]-1) * module.stride[0] - 2 * module.padding[0] + 1 * (module.kernel_size[0]-1) + 0 + 1)
-    new_w = int((input.shape[3]-1) * module.stride[1] - 2 * module.padding[1] + 1 * (module.kernel_size[1]-1) + 0 + 1)
-    description = ConvLayerDescription(
-        name=name,
-        g=module.groups,
-        m=output.shape[1],
-        # w=input.shape[3],
-        # h=input.shape[2],
-        w=new_w,
-        h=new_h,
-        c=input.shape[1],
-        n=input.shape[0],
-        s=module.kernel_size[1],
-        r=module.kernel_size[0],
-        w_pad=module.padding[1],
-        h_pad=module.padding[0],
-        w_stride=module.stride[1],
-        h_stride=module.stride[0],
-        ifmap_name=ifmap_name,
-        filter_name=f'{name}_filter',
-        ofmap_name=f'{name}_out'
-    )
+
+def _convT_desc(module, input_shape, output_shape, name, ifmap_name):
+    n, c, h, w = input_shape
+    kh, kw = module.kernel_size
+    sh, sw = module.stride
+    ph, pw = module.padding
+    filter_name, ofmap_name = name + '_filter', name + '_out'
+    # model as conv layers (dilation = 1, output_padding = 0)
+    new_h = (h - 1) * sh - 2 * ph + kh
+    new_w = (w - 1) * sw - 2 * pw + kw
+    # w and h are the conv-equivalent input size, not input_shape
+    description = ConvLayerDescription(name, module.groups, output_shape[1],
+                                       new_w, new_h, c, n, kw, kh,
+                                       pw, ph, sw, sh,
+                                       ifmap_name, filter_name, ofmap_name)
     return description
 
 
-@generate_description.register(nn.MaxPool2d)
-def _(module, input, output, name, ifmap_name):
-    if isinstance(module.kernel_size, int):
-        kernel_size = (module.kernel_size, module.kernel_size)
-    else:
-        kernel_size = module.kernel_size
-    if isinstance(module.stride, int):
-        stride = (module.stride, module.stride)
-    else:
-        stride = module.stride
-    if isinstance(module.padding, int):
-        padding = (module.padding, module.padding)
-    else:
-        padding = module.padding
+def _maxpool_desc(module, input_shape, output_shape, name, ifmap_name):
+    n, c, h, w = input_shape
+    kernel_size = _pair(module.kernel_size)
+    stride = _pair(module.stride)
+    padding = _pair(module.padding)
 
     description = MaxPoolLayerDescription(
-        w=input.shape[3],
-        h=input.shape[2],
-        c=input.shape[1],
+        w=w,
+        h=h,
+        c=c,
         s=kernel_size[1],
         r=kernel_size[0],
         w_stride=stride[1],
         h_stride=stride[0],
         w_pad=padding[1],
         h_pad=padding[0],
-        n=input.shape[0],
+        n=n,
         name=name,
         ifmap_name=ifmap_name,
         ofmap_name=f'{name}_out'
@@ -132,24 +87,25 @@ def _(module, input, output, name, ifmap_name):
     return description
 
 
-@generate_description.register(nn.AdaptiveAvgPool2d)
-def _(module, input, output, name, ifmap_name):
-    stride_w = input.shape[-1] // output.shape[-1]
-    stride_h = input.shape[-2] // output.shape[-2]
-    kernel_w = input.shape[-1] - (output.shape[-1]-1)*stride_w
-    kernel_h = input.shape[-2] - (output.shape[-2]-1)*stride_h
+def _adapt_desc(module, input_shape, output_shape, name, ifmap_name):
+    n, c, h, w = input_shape
+    out_h, out_w = output_shape[-2:]
+    stride_w = w // out_w
+    stride_h = h // out_h
+    kernel_w = w - (out_w-1)*stride_w
+    kernel_h = h - (out_h-1)*stride_h
 
     description = MaxPoolLayerDescription(
-        w=input.shape[3],
-        h=input.shape[2],
-        c=input.shape[1],
+        w=w,
+        h=h,
+        c=c,
         s=kernel_w,
         r=kernel_h,
         w_stride=stride_w,
         h_stride=stride_h,
         w_pad=0,
         h_pad=0,
-        n=input.shape[0],
+        n=n,
         name=name,
         ifmap_name=ifmap_name,
         ofmap_name=f'{name}_out'
@@ -158,56 +114,86 @@ def _(module, input, output, name, ifmap_name):
     return description
 
 
-@generate_description.register(nn.Linear)
-def _(module, input, output, name, ifmap_name):
-    description = ConvLayerDescription(
-        g=1,
-        w=1,
-        h=1,
-        c=module.in_features,
-        m=module.out_features,
-        s=1,
-        r=1,
-        w_stride=1,
-        h_stride=1,
-        w_pad=0,
-        h_pad=0,
-        n=input.shape[0],
-        name=name,
-        ifmap_name=ifmap_name,
-        filter_name=f'{name}_filter',
-        ofmap_name=f'{name}_out'
-    )
+def _linear_desc(module, input_shape, output_shape, name, ifmap_name):
+    filter_name, ofmap_name = name + '_filter', name + '_out'
+    description = ConvLayerDescription(name, 1, module.out_features, 1, 1,
+                                       module.in_features, input_shape[0],
+                                       1, 1, 0, 0, 1, 1,
+                                       ifmap_name, filter_name, ofmap_name)
     return description
 
 
+_HANDLERS: Dict[type, Callable] = {
+    nn.Conv2d: _conv2d_desc,
+    nn.ConvTranspose2d: _convT_desc,
+    nn.MaxPool2d: _maxpool_desc,
+    nn.AdaptiveAvgPool2d: _adapt_desc,
+    nn.Linear: _linear_desc
+}
+
+
+def _handler_for(module):
+    fn = _HANDLERS.get(type(module))
+    if fn is not None:
+        return fn
+    # subclasses of supported layers are not in the table; remember the
+    # match so later calls for the same type take the fast path
+    for module_type, fn in list(_HANDLERS.items()):
+        if isinstance(module, module_type):
+            _HANDLERS[type(module)] = fn
+            return fn
+    raise NotImplementedError(f'not implemented for {type(module)}')
+
+
+def generate_description(module, input, output, name, ifmap_name):
+    fn = _handler_for(module)
+    return fn(module, input.shape, output.shape, name, ifmap_name)
+
+
+def defer_description(module, input, output, name, ifmap_name):
+    """
+    Record what `generate_description` needs without building the
+    description, so that the work can happen after evaluation instead of
+    while the model is running. Only the shapes are kept, not the tensors.
+
+    The handler is looked up here, so unsupported modules still fail at
+    the node that uses them.
+
+    :return: a pending entry to be materialized by `drain()`
+    """
+    fn = _handler_for(module)
+    return (fn, module, input.shape, output.shape, name, ifmap_name)
+
+
+def drain(entries):
+    """
+    Materialize pending entries from `defer_description()`.
+
+    :param entries: a sequence of pending entries and/or already-built
+        `LayerDescription`s, which are passed through unchanged
+    :return: a list of `LayerDescription`s, in the same order
+    """
+    return [e[0](*e[1:]) if type(e) is tuple else e for e in entries]
+
+
 def generate_matmul_func(input1, input2, output,
                          name, input1_name, input2_name):
-    if len(input1.shape) == 2 and len(input2.shape) == 2:
-        description = MatmulFuncDescription(
-            name = name,
-            m = input1.shape[0],
-            n = input2.shape[1],
-            k = input1.shape[1],
-            ifmap1_name = input1_name,
-            ifmap2_name = input2_name,
-            ofmap_name = f'{name}_out',
-            extra_dims = tuple()
-        )
-    elif len(input1.shape) > 2 and input1.shape[:-2] == input2.shape[:-2]:
-        description = MatmulFuncDescription(
-            name = name,
-            m = input1.shape[0],
-            n = input2.shape[1],
-            k = input1.shape[1],
-            ifmap1_name = input1_name,
-            ifmap2_name = input2_name,
-            ofmap_name = f'{name}_out',
-            extra_dims = input1.shape[:-2]
-        )
-    else:
+    s1, s2 = input1.shape, input2.shape
+    if len(s1) < 2 or len(s2) < 2 or s1[:-2] != s2[:-2]:
         raise NotImplementedError(
-            f'unimplemented for arg shapes {input1.shape}, {input2.shape}'
+            f'unimplemented for arg shapes {s1}, {s2}'
         )
+    assert(s1[-1] == s2[-2])
+
+    description = MatmulFuncDescription(
+        name = name,
+        m = s1[-2],
+        n = s2[-1],
+        k = s1[-1],
+        ifmap1_name = input1_name,
+        ifmap2_name = input2_name,
+        ofmap_name = f'{name}_out',
+        extra_dims = s1[:-2]
+    )
 
     return description
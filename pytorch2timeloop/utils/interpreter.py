@@ -8,7 +8,7 @@ from torch import nn
 import torch.nn.functional as F
 import torch.fx as fx
 
-from .converter import generate_description, generate_matmul_func
+from .converter import defer_description, drain, generate_matmul_func
 from pytorch2timeloop.utils.layer_descriptions import (
     BinaryElementwiseFuncDescription,
     SoftmaxFuncDescription,
@@ -57,9 +57,13 @@ class Converter(fx.Interpreter):
         F.softmax
     ]
 
+    # shape used for scalar operands; torch.Size is immutable, so one
+    # instance is shared rather than allocating a new one per call
+    SCALAR_SHAPE = torch.Size([1])
+
     def __init__(self, module, garbage_collect_values=True,
                  bypassed_modules=None, ignored_modules=None,
-                 ignored_func=None):
+                 ignored_func=None, skip_repeated_modules=False):
         super().__init__(module, garbage_collect_values)
         self.name_to_module = dict(module.named_modules())
         self.tensor_sizes = {}
@@ -79,6 +83,16 @@ class Converter(fx.Interpreter):
 
         self.bypassed_arg_remap = {}
 
+        # (module target, input shape) pairs already described, used when
+        # a shared module is called repeatedly with the same input
+        self.skip_repeated_modules = skip_repeated_modules
+        self.described_modules = set()
+
+    def run(self, *args, **kwargs):
+        result = super().run(*args, **kwargs)
+        self.summary = drain(self.summary)
+        return result
+
     def run_node(self, n):
         name = n.name
         original_args = n.args
@@ -106,14 +120,21 @@ class Converter(fx.Interpreter):
                 f'{original_args[0].name}_out'
             return result
 
+        if self.skip_repeated_modules:
+            key = (target, args[0].shape)
+            if key in self.described_modules:
+                logger.debug('skipping repeated module %s[target=%s]',
+                             name, target)
+                return result
+            self.described_modules.add(key)
+
         arg_name = f'{original_args[0].name}_out'
         while arg_name in self.bypassed_arg_remap:
             arg_name = self.bypassed_arg_remap[arg_name]
 
-        description = generate_description(module, args[0], result, name,
-                                           arg_name)
-
-        self.summary.append(description)
+        # materialized in run(), once evaluation is done
+        self.summary.append(defer_description(module, args[0], result, name,
+                                              arg_name))
 
         return result
 
@@ -140,11 +161,11 @@ class Converter(fx.Interpreter):
         elif target in Converter.BINARY_ELEMENTWISE_FUNC:
             if isinstance(args[1], torch.Tensor):
                 if (isinstance(args[0], int)):
-                    shape0 = torch.Size([1])
+                    shape0 = Converter.SCALAR_SHAPE
                 else:
                     shape0 = args[0].shape
                 if (isinstance(args[1], int)):
-                    shape1 = torch.Size([1])
+                    shape1 = Converter.SCALAR_SHAPE
                 else:
                     shape1 = args[1].shape
                 description = BinaryElementwiseFuncDescription(
@@ -158,22 +179,24 @@ class Converter(fx.Interpreter):
                 )
                 self.summary.append(description)
         elif target == F.adaptive_avg_pool2d:
-            stride_w = args[0].shape[-1] // result.shape[-1]
-            stride_h = args[0].shape[-2] // result.shape[-2]
-            kernel_w = args[0].shape[-1] - (result.shape[-1]-1)*stride_w
-            kernel_h = args[0].shape[-2] - (result.shape[-2]-1)*stride_h
+            n, c, h, w = args[0].shape
+            out_h, out_w = result.shape[-2:]
+            stride_w = w // out_w
+            stride_h = h // out_h
+            kernel_w = w - (out_w-1)*stride_w
+            kernel_h = h - (out_h-1)*stride_h
 
             description = MaxPoolLayerDescription(
-                w=args[0].shape[3],
-                h=args[0].shape[2],
-                c=args[0].shape[1],
+                w=w,
+                h=h,
+                c=c,
                 s=kernel_w,
                 r=kernel_h,
                 w_stride=stride_w,
                 h_stride=stride_h,
                 w_pad=0,
                 h_pad=0,
-                n=args[0].shape[0],
+                n=n,
                 name=name,
                 ifmap_name=arg_names[0],
                 ofmap_name=f'{name}_out'
@@ -7,23 +7,158 @@ define helper properties (like p and q for convolutional layers).
 A layer description may use any YAML template (the name of the file that will be used is given by the `problem_template`
 attribute). Furthermore, any number of descriptions may use the same template but map the parameters differently.
 """
-from functools import reduce
+from functools import lru_cache
+from math import prod
+import pickle
 import string
+import sys
 from typing import Optional, Sequence
 import pkgutil
 
 import yaml
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
 from dataclasses import dataclass
 
+# Descriptions are allocated per layer, so drop the per-instance __dict__
+# where dataclasses can do it for us (Python 3.10+). Slotted dataclasses are
+# rebuilt as new classes, which breaks zero-argument super(); call the base
+# class explicitly instead.
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Dimension names: fixed for convolutions, otherwise assigned in order
+_CONV_DIMS = ('G', 'C', 'M', 'R', 'S', 'N', 'P', 'Q')
+_ALPHABET = string.ascii_uppercase
+
+
+@lru_cache(maxsize=None)
+def _load_template(name):
+    """
+    Parse a YAML problem template shipped with the package. Templates never
+    change at runtime, so each one is read and parsed only once, and kept
+    pickled: unpickling a fresh copy is several times faster than
+    `copy.deepcopy` of the parsed dict.
+    """
+    f = pkgutil.get_data("pytorch2timeloop", f"utils/{name}.yaml")
+    return pickle.dumps(yaml.load(f, Loader=SafeLoader),
+                        protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _conv_config(name, g, c, m, n, r, s, p, q, h_stride, w_stride,
+                 transposed=False):
+    """
+    Build the problem config for a grouped convolution, where `c` and `m`
+    are the per-group channel counts. For transposed convolutions, the
+    sliding-window projection is on the outputs rather than the inputs.
+
+    A fresh dict is built on every call (rather than copying a shared
+    prototype), since a dict literal is much cheaper than `copy.deepcopy`.
+    """
+    # a new list per config, so yaml.dump never emits aliases between layers
+    dims = list(_CONV_DIMS)
+    (dim_G, dim_C, dim_M, dim_R, dim_S, dim_N, dim_P, dim_Q) = _CONV_DIMS
+
+    windowed = [
+        [[dim_N]],
+        [[dim_G, 'Cgroup'], [dim_C, 'Nop']],
+        [[dim_R, 'Nop'], [dim_P, 'Hstride']],
+        [[dim_S, 'Nop'], [dim_Q, 'Wstride']]
+    ]
+    direct = [
+        [[dim_N]],
+        [[dim_G, 'Mgroup'], [dim_M, 'Nop']],
+        [[dim_P]],
+        [[dim_Q]]
+    ]
+    if transposed:
+        windowed[1] = [[dim_G, 'Mgroup'], [dim_M, 'Nop']]
+        direct[1] = [[dim_G, 'Cgroup'], [dim_C, 'Nop']]
+        inputs_projection, outputs_projection = direct, windowed
+    else:
+        inputs_projection, outputs_projection = windowed, direct
+
+    config = {
+        'shape': {
+            'name': name,
+            'dimensions': dims,
+            'coefficients': [
+                {
+                    'name': 'Cgroup',
+                    'default': c
+                },
+                {
+                    'name': 'Mgroup',
+                    'default': m
+                },
+                {
+                    'name': 'Hstride',
+                    'default': h_stride
+                },
+                {
+                    'name': 'Wstride',
+                    'default': w_stride
+                },
+                {
+                    'name': 'Nop',
+                    'default': 1
+                }
+            ],
+            'data-spaces': [
+                {
+                    'name': 'Weights',  # self.filter_name,
+                    'projection': [
+                        [[dim_G]],
+                        [[dim_C]],
+                        [[dim_M]],
+                        [[dim_R]],
+                        [[dim_S]]
+                    ]
+                },
+                {
+                    'name': 'Inputs',  # self.ifmap_name,
+                    'projection': inputs_projection
+                },
+                {
+                    'name': 'Outputs',  # self.ofmap_name,
+                    'projection': outputs_projection,
+                    'read-write': True
+                }
+            ]
+        },
+        'instance': {
+            'G': g,
+            'C': c,
+            'M': m,
+            'N': n,
+            'R': r,
+            'S': s,
+            'P': p,
+            'Q': q
+        }
+    }
+
+    return config
+
+
+def _row_major_strides(shape):
+    """
+    Return the stride of each dimension of a contiguous tensor with the
+    given shape (the product of the sizes of all later dimensions).
+    """
+    strides = [1] * len(shape)
+    for i in range(len(shape) - 1, 0, -1):
+        strides[i - 1] = strides[i] * shape[i]
+    return strides
+
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class LayerDescription:
     name: str
 
     def get_workload(self):
-        f = pkgutil.get_data("pytorch2timeloop",
-                             f"utils/{self.problem_template}.yaml")
-        return yaml.load(f, Loader=yaml.SafeLoader)
+        return pickle.loads(_load_template(self.problem_template))
 
     def to_yaml(self):
         config = self.get_workload()
@@ -31,8 +166,10 @@ class LayerDescription:
         return config
 
       
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ConvLayerDescription(LayerDescription):
+    # The handlers in converter.py construct this positionally; do not
+    # reorder these fields.
     g: int
     m: int
     w: int
@@ -51,174 +188,25 @@ class ConvLayerDescription(LayerDescription):
 
     @property
     def q(self):
-        return int((self.w - self.s + 2 * self.w_pad) / self.w_stride) + 1
+        return (self.w - self.s + 2 * self.w_pad) // self.w_stride + 1
 
     @property
     def p(self):
-        return int((self.h - self.r + 2 * self.h_pad) / self.h_stride) + 1
+        return (self.h - self.r + 2 * self.h_pad) // self.h_stride + 1
 
-    def to_yaml(self):
-        # dims = list(map(lambda n: self.name + '_' + n, 'GCMRSNPQ'))
-        dims = list('GCMRSNPQ')
-        (dim_G, dim_C, dim_M, dim_R, dim_S, dim_N, dim_P, dim_Q) = dims
-
-        in_channels_per_group = self.c // self.g
-        out_channels_per_group = self.m // self.g
-
-        config = {
-            'shape': {
-                'name': self.name,
-                'dimensions': dims,
-                'coefficients': [
-                    {
-                        'name': 'Cgroup',
-                        'default': in_channels_per_group
-                    },
-                    {
-                        'name': 'Mgroup',
-                        'default': out_channels_per_group
-                    },
-                    {
-                        'name': 'Hstride',
-                        'default': self.h_stride
-                    },
-                    {
-                        'name': 'Wstride',
-                        'default': self.w_stride
-                    },
-                    {
-                        'name': 'Nop',
-                        'default': 1
-                    }
-                ],
-                'data-spaces': [
-                    {
-                        'name': 'Weights',  # self.filter_name,
-                        'projection': [
-                            [[dim_G]],
-                            [[dim_C]],
-                            [[dim_M]],
-                            [[dim_R]],
-                            [[dim_S]]
-                        ]
-                    },
-                    {
-                        'name': 'Inputs',  # self.ifmap_name,
-                        'projection': [
-                            [[dim_N]],
-                            [[dim_G, 'Cgroup'], [dim_C, 'Nop']],
-                            [[dim_R, 'Nop'], [dim_P, 'Hstride']],
-                            [[dim_S, 'Nop'], [dim_Q, 'Wstride']]
-                        ]
-                    },
-                    {
-                        'name': 'Outputs',  # self.ofmap_name,
-                        'projection': [
-                            [[dim_N]],
-                            [[dim_G, 'Mgroup'], [dim_M, 'Nop']],
-                            [[dim_P]],
-                            [[dim_Q]]
-                        ],
-                        'read-write': True
-                    }
-                ]
-            },
-            'instance': {
-                'G': self.g,
-                'C': in_channels_per_group,
-                'M': out_channels_per_group,
-                'N': self.n,
-                'R': self.r,
-                'S': self.s,
-                'P': self.p,
-                'Q': self.q
-            }
-        }
+    def _build_config(self):
+        return _conv_config(self.name, self.g, self.c // self.g,
+                            self.m // self.g, self.n, self.r, self.s,
+                            self.p, self.q, self.h_stride, self.w_stride)
 
-        return config
+    def to_yaml(self):
+        return self._build_config()
 
     def to_fused_yaml(self):
-        # dims = list(map(lambda n: self.name + '_' + n, 'GCMRSNPQ'))
-        dims = list('GCMRSNPQ')
-        (dim_G, dim_C, dim_M, dim_R, dim_S, dim_N, dim_P, dim_Q) = dims
-
-        in_channels_per_group = self.c // self.g
-        out_channels_per_group = self.m // self.g
-
-        config = {
-            'shape': {
-                'name': self.name,
-                'dimensions': dims,
-                'coefficients': [
-                    {
-                        'name': 'Cgroup',
-                        'default': in_channels_per_group
-                    },
-                    {
-                        'name': 'Mgroup',
-                        'default': out_channels_per_group
-                    },
-                    {
-                        'name': 'Hstride',
-                        'default': self.h_stride
-                    },
-                    {
-                        'name': 'Wstride',
-                        'default': self.w_stride
-                    },
-                    {
-                        'name': 'Nop',
-                        'default': 1
-                    }
-                ],
-                'data-spaces': [
-                    {
-                        'name': 'Weights',  # self.filter_name,
-                        'projection': [
-                            [[dim_G]],
-                            [[dim_C]],
-                            [[dim_M]],
-                            [[dim_R]],
-                            [[dim_S]]
-                        ]
-                    },
-                    {
-                        'name': 'Inputs',  # self.ifmap_name,
-                        'projection': [
-                            [[dim_N]],
-                            [[dim_G, 'Cgroup'], [dim_C, 'Nop']],
-                            [[dim_R, 'Nop'], [dim_P, 'Hstride']],
-                            [[dim_S, 'Nop'], [dim_Q, 'Wstride']]
-                        ]
-                    },
-                    {
-                        'name': 'Outputs',  # self.ofmap_name,
-                        'projection': [
-                            [[dim_N]],
-                            [[dim_G, 'Mgroup'], [dim_M, 'Nop']],
-                            [[dim_P]],
-                            [[dim_Q]]
-                        ],
-                        'read-write': True
-                    }
-                ]
-            },
-            'instance': {
-                'G': self.g,
-                'C': in_channels_per_group,
-                'M': out_channels_per_group,
-                'N': self.n,
-                'R': self.r,
-                'S': self.s,
-                'P': self.p,
-                'Q': self.q
-            }
-        }
-
-        return config
+        return self._build_config()
 
 # Conv Transpose Does not work right now. Do not use. 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ConvTransposeLayerDescription(LayerDescription):
     g: int
     m: int
@@ -242,189 +230,40 @@ class ConvTransposeLayerDescription(LayerDescription):
     def q(self):
         # (Win​−1)×stride[1]−2×padding[1]+dilation[1]×(kernel_size[1]−1)+output_padding[1]+1
         # dilation = 1, output_padding = 0
-        return int((self.w-1) * self.w_stride - 2 * self.w_pad + 1 * (self.s-1) + 0 + 1)
+        return (self.w - 1) * self.w_stride - 2 * self.w_pad + self.s
 
     @property
     def p(self):
         # (Hin​−1)×stride[0]−2×padding[0]+dilation[0]×(kernel_size[0]−1)+output_padding[0]+1
         # dilation = 1, output_padding = 0
-        return int((self.h-1) * self.h_stride - 2 * self.h_pad + 1 * (self.r-1) + 0 + 1)
+        return (self.h - 1) * self.h_stride - 2 * self.h_pad + self.r
 
-    def to_yaml(self):
-        # dims = list(map(lambda n: self.name + '_' + n, 'GCMRSNPQ'))
+    def _build_config(self):
         # dims P and H are input height and width respectively
-        dims = list('GCMRSNPQ')
-        (dim_G, dim_C, dim_M, dim_R, dim_S, dim_N, dim_P, dim_Q) = dims
+        # (the suffix is not stored back, so repeated calls are stable)
+        name = self.name + "_transpose"
 
-        in_channels_per_group = self.c // self.g
-        out_channels_per_group = self.m // self.g
+        return _conv_config(name, self.g, self.c // self.g,
+                            self.m // self.g, self.n, self.r, self.s,
+                            self.h, self.w, self.h_stride, self.w_stride,
+                            transposed=True)
 
-        self.name += "_transpose"
-
-        config = {
-            'shape': {
-                'name': self.name,
-                'dimensions': dims,
-                'coefficients': [
-                    {
-                        'name': 'Cgroup',
-                        'default': in_channels_per_group
-                    },
-                    {
-                        'name': 'Mgroup',
-                        'default': out_channels_per_group
-                    },
-                    {
-                        'name': 'Hstride',
-                        'default': self.h_stride
-                    },
-                    {
-                        'name': 'Wstride',
-                        'default': self.w_stride
-                    },
-                    {
-                        'name': 'Nop',
-                        'default': 1
-                    }
-                ],
-                'data-spaces': [
-                    {
-                        'name': 'Weights',  # self.filter_name,
-                        'projection': [
-                            [[dim_G]],
-                            [[dim_C]],
-                            [[dim_M]],
-                            [[dim_R]],
-                            [[dim_S]]
-                        ]
-                    },
-                    {
-                        'name': 'Inputs',  # self.ifmap_name,
-                        'projection': [
-                            [[dim_N]],
-                            [[dim_G, 'Cgroup'], [dim_C, 'Nop']],
-                            [[dim_P]],
-                            [[dim_Q]]
-                        ]
-                    },
-                    {
-                        'name': 'Outputs',  # self.ofmap_name,
-                        'projection': [
-                            [[dim_N]],
-                            [[dim_G, 'Mgroup'], [dim_M, 'Nop']],
-                            [[dim_R, 'Nop'], [dim_P, 'Hstride']],
-                            [[dim_S, 'Nop'], [dim_Q, 'Wstride']]
-                        ],
-                        'read-write': True
-                    }
-                ]
-            },
-            'instance': {
-                'G': self.g,
-                'C': in_channels_per_group,
-                'M': out_channels_per_group,
-                'N': self.n,
-                'R': self.r,
-                'S': self.s,
-                'P': self.h,
-                'Q': self.w,
-            }
-        }
-
-        return config
+    def to_yaml(self):
+        return self._build_config()
 
     def to_fused_yaml(self):
-        # dims = list(map(lambda n: self.name + '_' + n, 'GCMRSNPQ'))
-        dims = list('GCMRSNPQ')
-        (dim_G, dim_C, dim_M, dim_R, dim_S, dim_N, dim_P, dim_Q) = dims
+        return self._build_config()
 
-        in_channels_per_group = self.c // self.g
-        out_channels_per_group = self.m // self.g
 
-        self.name += "_transpose"
-
-        config = {
-            'shape': {
-                'name': self.name,
-                'dimensions': dims,
-                'coefficients': [
-                    {
-                        'name': 'Cgroup',
-                        'default': in_channels_per_group
-                    },
-                    {
-                        'name': 'Mgroup',
-                        'default': out_channels_per_group
-                    },
-                    {
-                        'name': 'Hstride',
-                        'default': self.h_stride
-                    },
-                    {
-                        'name': 'Wstride',
-                        'default': self.w_stride
-                    },
-                    {
-                        'name': 'Nop',
-                        'default': 1
-                    }
-                ],
-                'data-spaces': [
-                    {
-                        'name': 'Weights',  # self.filter_name,
-                        'projection': [
-                            [[dim_G]],
-                            [[dim_C]],
-                            [[dim_M]],
-                            [[dim_R]],
-                            [[dim_S]]
-                        ]
-                    },
-                    {
-                        'name': 'Inputs',  # self.ifmap_name,
-                        'projection': [
-                            [[dim_N]],
-                            [[dim_G, 'Cgroup'], [dim_C, 'Nop']],
-                            [[dim_P]],
-                            [[dim_Q]]
-                        ]
-                    },
-                    {
-                        'name': 'Outputs',  # self.ofmap_name,
-                        'projection': [
-                            [[dim_N]],
-                            [[dim_G, 'Mgroup'], [dim_M, 'Nop']],
-                            [[dim_R, 'Nop'], [dim_P, 'Hstride']],
-                            [[dim_S, 'Nop'], [dim_Q, 'Wstride']]
-                        ],
-                        'read-write': True
-                    }
-                ]
-            },
-            'instance': {
-                'G': self.g,
-                'C': in_channels_per_group,
-                'M': out_channels_per_group,
-                'N': self.n,
-                'R': self.r,
-                'S': self.s,
-                'P': self.h,
-                'Q': self.w,
-            }
-        }
-
-        return config
-
-
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class MaxPoolLayerDescription(LayerDescription):
     @property
     def q(self):
-        return int((self.w - self.s + 2 * self.w_pad) / self.w_stride) + 1
+        return (self.w - self.s + 2 * self.w_pad) // self.w_stride + 1
 
     @property
     def p(self):
-        return int((self.h - self.r + 2 * self.h_pad) / self.h_stride) + 1
+        return (self.h - self.r + 2 * self.h_pad) // self.h_stride + 1
 
     problem_template = 'pool'
 
@@ -442,34 +281,36 @@ class MaxPoolLayerDescription(LayerDescription):
     ofmap_name: str
 
     def to_yaml(self):
-        config = super().to_yaml()
-        config['problem']['instance']['R'] = self.r
-        config['problem']['instance']['S'] = self.s
-        config['problem']['instance']['P'] = self.p
-        config['problem']['instance']['Q'] = self.q
-        config['problem']['instance']['C'] = self.c
-        config['problem']['instance']['N'] = self.n
-        config['problem']['instance']['Wstride'] = self.w_stride
-        config['problem']['instance']['Hstride'] = self.h_stride
+        config = LayerDescription.to_yaml(self)
+        instance = config['problem']['instance']
+        instance['R'] = self.r
+        instance['S'] = self.s
+        instance['P'] = self.p
+        instance['Q'] = self.q
+        instance['C'] = self.c
+        instance['N'] = self.n
+        instance['Wstride'] = self.w_stride
+        instance['Hstride'] = self.h_stride
 
         return config
 
     def to_fused_yaml(self):
-        config = super().to_fused_yaml()
-        config['problem']['instance']['R'] = self.r
-        config['problem']['instance']['S'] = self.s
-        config['problem']['instance']['P'] = self.p
-        config['problem']['instance']['Q'] = self.q
-        config['problem']['instance']['C'] = self.c
-        config['problem']['instance']['N'] = self.n
-        config['problem']['instance']['Wstride'] = self.w_stride
-        config['problem']['instance']['Hstride'] = self.h_stride
+        config = LayerDescription.to_fused_yaml(self)
+        instance = config['problem']['instance']
+        instance['R'] = self.r
+        instance['S'] = self.s
+        instance['P'] = self.p
+        instance['Q'] = self.q
+        instance['C'] = self.c
+        instance['N'] = self.n
+        instance['Wstride'] = self.w_stride
+        instance['Hstride'] = self.h_stride
 
         return config
 
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class MatrixMatrixMultiplyLayerDescription(LayerDescription):
     name: Optional[str]
     problem_template = "convolution"
@@ -479,21 +320,21 @@ class MatrixMatrixMultiplyLayerDescription(LayerDescription):
     batch_size: int
 
     def to_yaml(self):
-        config = super().to_yaml()
-        config['problem']['instance']['R'] = 1
-        config['problem']['instance']['S'] = self.k
-        config['problem']['instance']['P'] = self.m
-        config['problem']['instance']['Q'] = 1
-        config['problem']['instance']['C'] = 1
-        config['problem']['instance']['M'] = self.n
-        config['problem']['instance']['N'] = self.batch_size
-        config['problem']['instance']['Wstride'] = 1
-        config['problem']['instance']['Hstride'] = 1
-        config['problem']['shape']['name'] = self.name
+        config = LayerDescription.to_yaml(self)
+        instance = config['problem']['instance']
+        instance['R'] = 1
+        instance['S'] = self.k
+        instance['P'] = self.m
+        instance['Q'] = 1
+        instance['C'] = 1
+        instance['M'] = self.n
+        instance['N'] = self.batch_size
+        instance['Wstride'] = 1
+        instance['Hstride'] = 1
         return config
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class BinaryElementwiseFuncDescription(LayerDescription):
     problem_template='binary_elementwise'
     ifmap1_shape: Sequence
@@ -504,34 +345,31 @@ class BinaryElementwiseFuncDescription(LayerDescription):
     ofmap_name: str
 
     def to_yaml(self):
-        if len(self.ifmap1_shape) < len(self.ofmap_shape):
-            n_missing_dims = len(self.ofmap_shape) - len(self.ifmap1_shape)
-            self.ifmap1_shape = tuple(
-                [1]*n_missing_dims + list(self.ifmap1_shape)
-            )
-        if len(self.ifmap2_shape) < len(self.ofmap_shape):
-            n_missing_dims = len(self.ofmap_shape) - len(self.ifmap2_shape)
-            self.ifmap2_shape = tuple(
-                [1]*n_missing_dims + list(self.ifmap2_shape)
-            )
-        assert(len(self.ifmap1_shape) == len(self.ofmap_shape))
-        assert(len(self.ifmap2_shape) == len(self.ofmap_shape))
+        # broadcast the inputs to the output rank, without modifying self
+        n_dims = len(self.ofmap_shape)
+        ifmap1_shape = (1,) * (n_dims - len(self.ifmap1_shape)) \
+            + tuple(self.ifmap1_shape)
+        ifmap2_shape = (1,) * (n_dims - len(self.ifmap2_shape)) \
+            + tuple(self.ifmap2_shape)
+        assert(len(ifmap1_shape) == n_dims)
+        assert(len(ifmap2_shape) == n_dims)
 
         # If all dim_sizes are 1, add 'exhaustive' to name
-        product = lambda l: reduce(lambda x, y: x*y, l)
-        ifmap_prod = product(self.ifmap1_shape)
+        ifmap_prod = prod(ifmap1_shape)
 
         if ifmap_prod == 1: 
-            self.name += "_exhaustive"
+            name = self.name + "_exhaustive"
+        else:
+            name = self.name
 
-        dims = list(string.ascii_uppercase[:len(self.ofmap_shape)])
+        dims = list(_ALPHABET[:n_dims])
         bounds = {}
-        for dim_name, dim_size in zip(dims, self.ifmap1_shape):
+        for dim_name, dim_size in zip(dims, ifmap1_shape):
             bounds[dim_name] = dim_size
 
         config = {
             'shape': {
-                'name': self.name,
+                'name': name,
                 'dimensions': dims,
                 'data-spaces': [
                     {
@@ -555,22 +393,18 @@ class BinaryElementwiseFuncDescription(LayerDescription):
         return config
 
     def to_fused_yaml(self):
-        if len(self.ifmap1_shape) < len(self.ofmap_shape):
-            n_missing_dims = len(self.ofmap_shape) - len(self.ifmap1_shape)
-            self.ifmap1_shape = tuple(
-                [1]*n_missing_dims + list(self.ifmap1_shape)
-            )
-        if len(self.ifmap2_shape) < len(self.ofmap_shape):
-            n_missing_dims = len(self.ofmap_shape) - len(self.ifmap2_shape)
-            self.ifmap2_shape = tuple(
-                [1]*n_missing_dims + list(self.ifmap2_shape)
-            )
-        assert(len(self.ifmap1_shape) == len(self.ofmap_shape))
-        assert(len(self.ifmap2_shape) == len(self.ofmap_shape))
-
-        dims = list(string.ascii_uppercase[:len(self.ofmap_shape)])
+        # broadcast the inputs to the output rank, without modifying self
+        n_dims = len(self.ofmap_shape)
+        ifmap1_shape = (1,) * (n_dims - len(self.ifmap1_shape)) \
+            + tuple(self.ifmap1_shape)
+        ifmap2_shape = (1,) * (n_dims - len(self.ifmap2_shape)) \
+            + tuple(self.ifmap2_shape)
+        assert(len(ifmap1_shape) == n_dims)
+        assert(len(ifmap2_shape) == n_dims)
+
+        dims = list(_ALPHABET[:n_dims])
         bounds = {}
-        for dim_name, dim_size in zip(dims, self.ifmap1_shape):
+        for dim_name, dim_size in zip(dims, ifmap1_shape):
             bounds[dim_name] = dim_size
 
         config = {
@@ -599,7 +433,7 @@ class BinaryElementwiseFuncDescription(LayerDescription):
         return config
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class MatmulFuncDescription(LayerDescription):
     problem_template = "matmul"
     m: int
@@ -611,36 +445,34 @@ class MatmulFuncDescription(LayerDescription):
     extra_dims: Optional[tuple] = None
 
     def to_yaml(self):
-        config = super().to_yaml()
+        config = LayerDescription.to_yaml(self)
 
-        if self.extra_dims is not None:
-            dims = tuple(string.ascii_uppercase[:len(self.extra_dims)])
-        else:
-            dims = tuple()
-            self.extra_dims = tuple()
+        extra_dims = self.extra_dims if self.extra_dims is not None else ()
+        dims = tuple(_ALPHABET[:len(extra_dims)])
 
-        for dspace in config['problem']['shape']['data-spaces']:
+        problem = config['problem']
+        for dspace in problem['shape']['data-spaces']:
             if dspace['name'] == 'Input1':
                 dspace['name'] = self.ifmap1_name
             elif dspace['name'] == 'Input2':
                 dspace['name'] = self.ifmap2_name
             elif dspace['name'] == 'Outputs':
                 dspace['name'] = self.ofmap_name
-            proj_dims = list(map(lambda d: [[d]], dims))
+            proj_dims = [[[d]] for d in dims]
             dspace['projection'] = proj_dims + dspace['projection']
 
-        config['problem']['instance']['K'] = self.k
-        config['problem']['instance']['M'] = self.m
-        config['problem']['instance']['N'] = self.n
-        config['problem']['shape']['name'] = self.name
+        instance = problem['instance']
+        instance['K'] = self.k
+        instance['M'] = self.m
+        instance['N'] = self.n
 
-        for dim, size in zip(dims, self.extra_dims):
-            config['problem']['instance'][dim] = size
+        for dim, size in zip(dims, extra_dims):
+            instance[dim] = size
 
         return config
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class SoftmaxFuncDescription(LayerDescription):
     problem_template = 'softmax'
     ifmap_shape: tuple
@@ -650,35 +482,30 @@ class SoftmaxFuncDescription(LayerDescription):
     softmax_dim: int
 
     def to_yaml(self):
-        config = super().to_yaml()
+        config = LayerDescription.to_yaml(self)
 
-        dims = tuple(string.ascii_uppercase[:len(self.ifmap_shape)+1])
+        dims = tuple(_ALPHABET[:len(self.ifmap_shape)+1])
 
-        for dspace in config['problem']['shape']['data-spaces']:
+        problem = config['problem']
+        for dspace in problem['shape']['data-spaces']:
             if dspace['name'] == 'Input':
                 dspace['name'] = self.ifmap_name
-                dspace['projection'] = list(map(
-                    lambda d: [[d]],
-                    dims[:-1]
-                ))
+                dspace['projection'] = [[[d]] for d in dims[:-1]]
             elif dspace['name'] == 'Output':
                 dspace['name'] = self.ofmap_name
-                dspace['projection'] = list(map(
-                    lambda d: [[d]],
-                    dims[:-1]
-                ))
+                dspace['projection'] = [[[d]] for d in dims[:-1]]
                 dspace['projection'][self.softmax_dim] = [[dims[-1]]]
 
         instance = {}
         for dim, size in zip(dims[:-1], self.ifmap_shape):
             instance[dim] = size
         instance[dims[-1]] = self.ofmap_shape[self.softmax_dim]
-        config['problem']['instance'] = instance
+        problem['instance'] = instance
 
         return config
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ViewFuncDescription(LayerDescription):
     problem_template = 'view'
     ifmap_shape: tuple
@@ -690,31 +517,29 @@ class ViewFuncDescription(LayerDescription):
         raise NotImplementedError('cannot be implemented in old Timeloop spec')
 
     def to_fused_yaml(self):
-        product = lambda l: reduce(lambda x, y: x*y, l)
-        assert(product(self.ifmap_shape) == product(self.ofmap_shape))
+        assert(prod(self.ifmap_shape) == prod(self.ofmap_shape))
 
         n_ofmap_dims = len(self.ofmap_shape)
-        ofmap_dims = list(string.ascii_uppercase[:n_ofmap_dims])
-
-        bounds = []
-        for dim_name, dim_size in zip(ofmap_dims, self.ofmap_shape):
-            bounds.append(f'0 <= {dim_name} < {dim_size}')
-        
-        terms = []
-        cur_size = 1
-        for dim, dim_size in reversed(list(zip(ofmap_dims, self.ofmap_shape))):
-            terms.append(f'{dim}*{cur_size}')
-            cur_size *= dim_size
-        linearized_ofmaps = ' + '.join(terms)
-
-        ifmap_terms = []
-        cur_size = 1
-        for dim_size in reversed(self.ifmap_shape):
-            ifmap_terms.append(
-                f'floor({linearized_ofmaps}/{cur_size})%{dim_size}'
-            )
-            cur_size *= dim_size
-        ifmap_terms.reverse()
+        ofmap_dims = list(_ALPHABET[:n_ofmap_dims])
+
+        bounds = [f'0 <= {dim_name} < {dim_size}'
+                  for dim_name, dim_size in zip(ofmap_dims, self.ofmap_shape)]
+
+        ofmap_strides = _row_major_strides(self.ofmap_shape)
+        linearized_ofmaps = ' + '.join(
+            f'{dim}*{stride}'
+            for dim, stride in zip(reversed(ofmap_dims),
+                                   reversed(ofmap_strides))
+        )
+
+        # the linearized index is shared by every term, so format it once;
+        # it must be parenthesized so the whole sum is divided by the stride
+        linearized_prefix = f'floor(({linearized_ofmaps})/'
+        ifmap_strides = _row_major_strides(self.ifmap_shape)
+        ifmap_terms = [
+            f'{linearized_prefix}{stride})%{dim_size}'
+            for dim_size, stride in zip(self.ifmap_shape, ifmap_strides)
+        ]
 
         config = {
             'shape': {
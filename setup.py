@@ -5,15 +5,12 @@ setup(name='pytorch2timeloop',
         url='https://github.com/PN-54/pytorch2timeloop-converter',
         license='MIT',
         install_requires=[
-            "torch==1.13.1",
-            "torchvision==0.14.1",
-            "numpy==1.22.4",
-            "pyyaml==5.3",
-            "transformers==4.26.0"
+            "torch>=1.13",
+            "torchvision>=0.14",
+            "numpy>=1.22",
+            "pyyaml>=6.0",
+            "transformers>=4.26"
         ],
-        dependency_links=[
-            "https://download.pytorch.org/whl/cpu/"
-        ],
-        python_requires='>=3.6',
+        python_requires='>=3.8',
         include_package_data=True,
         packages=find_packages())
@@ -0,0 +1,24 @@
+import unittest
+
+from pytorch2timeloop.utils.layer_descriptions import ViewFuncDescription
+
+class TestViewFunc(unittest.TestCase):
+    def test_fused_projection_3d_to_2d(self):
+        description = ViewFuncDescription(
+            name='view',
+            ifmap_shape=(2, 3, 4),
+            ofmap_shape=(6, 4),
+            ifmap_name='x_out',
+            ofmap_name='view_out'
+        )
+        config = description.to_fused_yaml()
+
+        # the whole linearized index is divided by each ifmap stride
+        ifmap, ofmap = config['shape']['data-spaces']
+        self.assertEqual(
+            ifmap['projection'],
+            '[ floor((B*1 + A*4)/12)%2, floor((B*1 + A*4)/4)%3, '
+            'floor((B*1 + A*4)/1)%4 ]'
+        )
+        self.assertEqual(ofmap['projection'], '[ A, B ]')
+        self.assertEqual(config['instance'], '0 <= A < 6 and 0 <= B < 4')
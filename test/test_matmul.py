@@ -0,0 +1,30 @@
+import unittest
+
+import torch
+from torch import nn
+import torch.fx as fx
+
+from pytorch2timeloop.utils.converter import generate_matmul_func
+from pytorch2timeloop.utils.interpreter import Converter
+
+class BatchedMatmul(nn.Module):
+    def forward(self, a, b):
+        return torch.matmul(a, b)
+
+class TestMatmul(unittest.TestCase):
+    def test_batched_matmul(self):
+        converter = Converter(fx.symbolic_trace(BatchedMatmul()))
+        converter.run(torch.rand(2, 3, 4), torch.rand(2, 4, 5))
+
+        self.assertEqual(len(converter.summary), 1)
+        description = converter.summary[0]
+        self.assertEqual(description.m, 3)
+        self.assertEqual(description.k, 4)
+        self.assertEqual(description.n, 5)
+        self.assertEqual(tuple(description.extra_dims), (2,))
+
+    def test_mismatched_inner_dim(self):
+        a, b = torch.rand(2, 3, 4), torch.rand(2, 5, 6)
+        with self.assertRaises(AssertionError):
+            generate_matmul_func(a, b, torch.rand(2, 3, 6), 'mm',
+                                 'a_out', 'b_out')
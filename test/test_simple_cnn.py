@@ -74,4 +74,32 @@ class TestGroupedConv(unittest.TestCase):
             model_name='grouped_conv',
             save_dir=TMP_TEST_DIR,
             exception_module_names=[]
-        )
\ No newline at end of file
+        )
+
+class SharedFC(nn.Module):
+    def __init__(self):
+        super(SharedFC, self).__init__()
+        self.fc = nn.Linear(16, 16)
+
+    def forward(self, x):
+        return self.fc(self.fc(x))
+
+class TestSharedModule(unittest.TestCase):
+    def setUp(self):
+        self.net = SharedFC()
+        self.input_size = (16,)
+        self.batch_size = 1
+
+    def test_skip_repeated_modules(self):
+        pytorch2timeloop.convert_model(
+            model=self.net,
+            input_size=self.input_size,
+            batch_size=self.batch_size,
+            convert_fc=True,
+            model_name='shared_fc',
+            save_dir=TMP_TEST_DIR,
+            exception_module_names=[],
+            skip_repeated_modules=True
+        )
+        layer_files = list((TMP_TEST_DIR / 'shared_fc').glob('*.yaml'))
+        self.assertEqual(len(layer_files), 1)